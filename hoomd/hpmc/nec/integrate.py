@@ -110,9 +110,12 @@ class HPMCNECIntegrator(HPMCIntegrator):
         """float: particles per chain.
 
         Note:
-            The statistics are reset at every `hoomd.Simulation.run`.
+            The statistics are reset at every `hoomd.Simulation.run`. Before
+            any chain starts this is 0.
         """
         necCounts = self._cpp_obj.getNECCounters(1)
+        if necCounts.chain_start_count == 0:
+            return 0.0
         return (necCounts.chain_at_collision_count * 1.0
                 / necCounts.chain_start_count)
 
@@ -121,12 +124,16 @@ class HPMCNECIntegrator(HPMCIntegrator):
         """float: rate of chain events that did neither collide nor end.
 
         Note:
-            The statistics are reset at every `hoomd.Simulation.run`.
+            The statistics are reset at every `hoomd.Simulation.run`. Before
+            any chain event this is 0.
         """
         necCounts = self._cpp_obj.getNECCounters(1)
-        return (necCounts.chain_no_collision_count - necCounts.chain_start_count
-                ) / (necCounts.chain_at_collision_count
-                     + necCounts.chain_no_collision_count)
+        chain_events = (necCounts.chain_at_collision_count
+                        + necCounts.chain_no_collision_count)
+        if chain_events == 0:
+            return 0.0
+        return (necCounts.chain_no_collision_count
+                - necCounts.chain_start_count) / chain_events
 
 
 class Sphere(HPMCNECIntegrator):
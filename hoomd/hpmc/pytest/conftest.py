@@ -1042,4 +1042,5 @@ def cpp_args_id(args):
                 params=_cpp_args(_valid_args),
                 ids=cpp_args_id)
 def cpp_args(request):
-    return deepcopy(request.param)
+    # test_dict_conversion only reads the arguments, share them across tests.
+    return request.param
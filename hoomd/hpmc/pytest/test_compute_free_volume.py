@@ -10,6 +10,19 @@ from hoomd.logging import LoggerCategories
 from hoomd.conftest import logging_check, autotuned_kernel_parameter_check
 
 
+@pytest.fixture(scope="module")
+def make_sphere_mc():
+    """Return a factory for unattached Sphere integrators for types A and B."""
+
+    def make(diameter_a, diameter_b):
+        mc = hoomd.hpmc.integrate.Sphere()
+        mc.shape["A"] = {'diameter': diameter_a}
+        mc.shape["B"] = {'diameter': diameter_b}
+        return mc
+
+    return make
+
+
 def test_before_attaching():
     free_volume = hoomd.hpmc.compute.FreeVolume(test_particle_type='B',
                                                 num_samples=100)
@@ -20,13 +33,11 @@ def test_before_attaching():
         free_volume.free_volume
 
 
-def test_after_attaching(simulation_factory, lattice_snapshot_factory):
+def test_after_attaching(simulation_factory, lattice_snapshot_factory,
+                         make_sphere_mc):
     snap = lattice_snapshot_factory(particle_types=['A', 'B'])
     sim = simulation_factory(snap)
-    mc = hoomd.hpmc.integrate.Sphere()
-    mc.shape["A"] = {'diameter': 1.0}
-    mc.shape["B"] = {'diameter': 0.2}
-    sim.operations.add(mc)
+    sim.operations.add(make_sphere_mc(1.0, 0.2))
 
     free_volume = hoomd.hpmc.compute.FreeVolume(test_particle_type='B',
                                                 num_samples=100)
@@ -42,42 +53,72 @@ def test_after_attaching(simulation_factory, lattice_snapshot_factory):
     assert isinstance(free_volume.free_volume, float)
 
 
-_radii = [
+_n = 7
+_radii = np.array([
     (0.25, 0.05),
     (0.4, 0.05),
     (0.7, 0.17),
-]
+])
+# Analytic free volume for each pair of radii on a simple cubic lattice.
+_free_volumes = np.maximum(
+    0.0, _n**3 * (1 - (4 / 3) * np.pi * _radii.sum(axis=1)**3))
 
 
-@pytest.mark.parametrize("radius1, radius2", _radii)
-def test_validation_systems(simulation_factory, lattice_snapshot_factory,
-                            radius1, radius2):
-    n = 7
-    free_volume = (n**3) * (1 - (4 / 3) * np.pi * (radius1 + radius2)**3)
-    free_volume = max([0.0, free_volume])
+@pytest.fixture(scope="module")
+def free_volume_simulation(simulation_factory, lattice_snapshot_factory,
+                           make_sphere_mc):
+    """Lattice simulation with an attached Sphere integrator.
+
+    The validation tests set the shapes and add their own `FreeVolume` compute,
+    so the simulation and integrator are only constructed once.
+    """
     sim = simulation_factory(
         lattice_snapshot_factory(particle_types=['A', 'B'],
-                                 n=n,
+                                 n=_n,
                                  a=1,
                                  dimensions=3,
                                  r=0))
 
-    mc = hoomd.hpmc.integrate.Sphere()
+    sim.operations.add(make_sphere_mc(1.0, 1.0))
+    sim.run(0)
+    return sim
+
+
+@pytest.mark.parametrize("radius1, radius2, free_volume",
+                         [(*radii, free_volume)
+                          for radii, free_volume in zip(_radii, _free_volumes)])
+def test_validation_systems(free_volume_simulation, radius1, radius2,
+                            free_volume):
+    sim = free_volume_simulation
+    mc = sim.operations.integrator
     mc.shape["A"] = {'diameter': radius1 * 2}
     mc.shape["B"] = {'diameter': radius2 * 2}
-    sim.operations.add(mc)
 
+    # A new compute is needed for each case as computes evaluate only once
+    # per timestep and sim.run(0) does not advance the timestep.
     free_volume_compute = hoomd.hpmc.compute.FreeVolume(test_particle_type='B',
                                                         num_samples=10000)
     sim.operations.add(free_volume_compute)
     sim.run(0)
+    computed_free_volume = free_volume_compute.free_volume
+    sim.operations.remove(free_volume_compute)
+
     # rtol is fairly high as the free volume available to a sized particle
     # is less than the total available volume
-    np.testing.assert_allclose(free_volume,
-                               free_volume_compute.free_volume,
-                               rtol=2e-2)
+    np.testing.assert_allclose(free_volume, computed_free_volume, rtol=2e-2)
+
+
+def test_kernel_parameters(simulation_factory, lattice_snapshot_factory,
+                           make_sphere_mc):
+    sim = simulation_factory(
+        lattice_snapshot_factory(particle_types=['A', 'B'], n=_n))
+    sim.operations.add(make_sphere_mc(0.5, 0.1))
+
+    free_volume_compute = hoomd.hpmc.compute.FreeVolume(test_particle_type='B',
+                                                        num_samples=10000)
+    sim.operations.add(free_volume_compute)
+    sim.run(0)
 
-    # Tet the kernel parameter tuner.
     def activate_tuner():
         sim.run(1)
         # We need to make the kernel be called.
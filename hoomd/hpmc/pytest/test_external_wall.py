@@ -4,26 +4,36 @@
 """Test hoomd.hpmc.external.wall."""
 
 from collections import defaultdict
+import copy
+import functools
 
 import hoomd
+from hoomd.hpmc.external.wall import _HPMCWallsMetaList
 from hoomd.hpmc.pytest.conftest import _valid_args
 import itertools
 import numpy as np
 import pytest
 
-wall_instances = [
+wall_instances = (
     hoomd.wall.Cylinder(1.0, (0, 0, 1)),
     hoomd.wall.Plane((0, 0, 0), (1, 1, 1)),
-    hoomd.wall.Sphere(1.0)
-]
-valid_wall_lists = []
-for r in 1, 2, 3:
-    walls_ = list(itertools.combinations(wall_instances, r))
-    valid_wall_lists.extend(walls_)
+    hoomd.wall.Sphere(1.0),
+)
+valid_wall_lists = list(
+    itertools.chain.from_iterable(
+        itertools.combinations(wall_instances, r) for r in (1, 2, 3)))
+
+
+def _wall_ids(wall_types):
+    """Name a combination of wall types for pytest ids."""
+    return "-".join(wall_type.__name__ for wall_type in wall_types)
 
 
 @pytest.mark.cpu
-@pytest.mark.parametrize("wall_list", valid_wall_lists)
+@pytest.mark.parametrize(
+    "wall_list",
+    valid_wall_lists,
+    ids=[_wall_ids(map(type, walls)) for walls in valid_wall_lists])
 def test_valid_construction(device, wall_list):
     """Test that WallPotential can be constructed with valid arguments."""
     walls = hoomd.hpmc.external.wall.WallPotential(wall_list)
@@ -39,38 +49,70 @@ default_wall_args = {
     hoomd.wall.Cylinder: (1.0, (0, 0, 1)),
     hoomd.wall.Plane: ((0, 0, 0), (1, 1, 1))
 }
+# Templates are deep copied before use, so the walls can be shared.
+default_walls = {wt: wt(*args) for wt, args in default_wall_args.items()}
+
+
+def _make_integrator(integrator_class, wall_list):
+    mc = integrator_class()
+    mc.shape['A'] = mc_params[integrator_class]
+    mc.external_potential = hoomd.hpmc.external.wall.WallPotential(wall_list)
+    return mc
+
+
+@functools.lru_cache(maxsize=None)
+def _default_integrator(integrator_class, wall_types):
+    """Template integrator with walls from `default_walls`."""
+    return _make_integrator(integrator_class,
+                            [default_walls[wt] for wt in wall_types])
 
 
 @pytest.fixture(scope="module")
 def add_default_integrator():
 
-    def add(simulation,
-            integrator_class,
-            wall_types,
-            use_default_wall_args=True):
-        mc = integrator_class()
-        mc.shape['A'] = mc_params[integrator_class]
-        if use_default_wall_args:
-            wall_list = [wt(*default_wall_args[wt]) for wt in wall_types]
-        else:
-            wall_list = wall_types
-        walls = hoomd.hpmc.external.wall.WallPotential(wall_list)
-        mc.external_potential = walls
+    def add(simulation, integrator_class, wall_types):
+        mc = copy.deepcopy(
+            _default_integrator(integrator_class, tuple(wall_types)))
         simulation.operations.integrator = mc
-        return mc, walls
+        return mc, mc.external_potential
 
-    return add
+    yield add
+    _default_integrator.cache_clear()
 
 
-_integrator_classes = []
-mc_params = {}
-for integrator_class, args, _ in _valid_args:
-    if isinstance(integrator_class, tuple):
-        _integrator_classes.append(integrator_class[0])
-        base_shape, integrator_class = integrator_class
-    else:
-        _integrator_classes.append(integrator_class)
-    mc_params.setdefault(integrator_class, args)
+def _reset_simulation(sim):
+    """Remove the integrator and unschedule so the next test starts fresh."""
+    if sim.operations._scheduled:
+        sim.operations._unschedule()
+    sim.operations.integrator = None
+
+
+@pytest.fixture(scope="module")
+def module_two_particle_simulation(simulation_factory,
+                                   two_particle_snapshot_factory):
+    return simulation_factory(two_particle_snapshot_factory())
+
+
+@pytest.fixture
+def two_particle_simulation(module_two_particle_simulation):
+    """Two particle simulation shared by the tests in this module."""
+    yield module_two_particle_simulation
+    _reset_simulation(module_two_particle_simulation)
+
+
+@pytest.fixture(scope="module")
+def module_one_particle_simulation(simulation_factory,
+                                   one_particle_snapshot_factory):
+    return simulation_factory(one_particle_snapshot_factory(L=100))
+
+
+# Union integrators are listed as (base shape integrator, union integrator).
+_integrator_classes = [
+    cls[0] if isinstance(cls, tuple) else cls for cls, _, _ in _valid_args
+]
+# Iterate in reverse so the first arguments given for each class are kept.
+mc_params = {(cls[1] if isinstance(cls, tuple) else cls): args
+             for cls, args, _ in reversed(_valid_args)}
 
 
 def default_wall_compatibility():
@@ -100,6 +142,32 @@ shape_wall_compatibilities.update({
     },
 })
 
+
+def _cover(shape_wall_combos):
+    """Mark the shape and wall combinations not needed for coverage.
+
+    The first case for each shape and for each wall type runs by default. The
+    remaining cases are marked ``all_combinations`` and run only with
+    ``--all-combinations``.
+    """
+    seen_shapes = set()
+    seen_walls = set()
+    params = []
+    for shape, wall in shape_wall_combos:
+        id_ = f"{shape.__name__}-{wall.__name__}"
+        if shape in seen_shapes and wall in seen_walls:
+            params.append(
+                pytest.param(shape,
+                             wall,
+                             marks=pytest.mark.all_combinations,
+                             id=id_))
+        else:
+            params.append(pytest.param(shape, wall, id=id_))
+        seen_shapes.add(shape)
+        seen_walls.add(wall)
+    return params
+
+
 valid_flattened_shape_wall_combos = []
 invalid_flattened_shape_wall_combos = []
 for shape in _integrator_classes:
@@ -108,38 +176,43 @@ for shape in _integrator_classes:
         [shape, wall] for wall, v in wall_info.items() if v)
     invalid_flattened_shape_wall_combos.extend(
         [shape, wall] for wall, v in wall_info.items() if not v)
+valid_flattened_shape_wall_combos = _cover(valid_flattened_shape_wall_combos)
+invalid_flattened_shape_wall_combos = _cover(
+    invalid_flattened_shape_wall_combos)
+
+
+def test_supported_shape_wall_pairs():
+    """Check the supported pairs without attaching to a simulation.
+
+    The attaching tests below exercise a covering subset of these pairs.
+    """
+    supported_pairs = _HPMCWallsMetaList._supported_shape_wall_pairs
+    for shape in set(_integrator_classes):
+        for wall, valid in shape_wall_compatibilities[shape].items():
+            assert (wall in supported_pairs.get(shape, [])) == valid
 
 
 @pytest.mark.cpu
 @pytest.mark.parametrize("shape_cls, wall", invalid_flattened_shape_wall_combos)
-def test_attaching_invalid_combos(simulation_factory,
-                                  two_particle_snapshot_factory,
+def test_attaching_invalid_combos(two_particle_simulation,
                                   add_default_integrator, shape_cls, wall):
-    sim = simulation_factory(two_particle_snapshot_factory())
+    sim = two_particle_simulation
     mc, walls = add_default_integrator(sim, shape_cls, [wall])
     with pytest.raises(NotImplementedError):
-        sim.run(0)
+        sim.operations._schedule()
 
 
 @pytest.mark.cpu
 @pytest.mark.parametrize("shape_cls, wall", valid_flattened_shape_wall_combos)
-def test_attaching_valid_combos(simulation_factory,
-                                two_particle_snapshot_factory,
-                                add_default_integrator, shape_cls, wall):
-    sim = simulation_factory(two_particle_snapshot_factory())
+def test_attaching_and_detaching_valid_combos(two_particle_simulation,
+                                              add_default_integrator,
+                                              shape_cls, wall):
+    sim = two_particle_simulation
     mc, walls = add_default_integrator(sim, shape_cls, [wall])
-    sim.run(0)
+    sim.operations._schedule()
     assert mc._attached
     assert walls._attached
 
-
-@pytest.mark.cpu
-@pytest.mark.parametrize("shape_cls, wall", valid_flattened_shape_wall_combos)
-def test_detaching(simulation_factory, two_particle_snapshot_factory,
-                   add_default_integrator, shape_cls, wall):
-    sim = simulation_factory(two_particle_snapshot_factory())
-    mc, walls = add_default_integrator(sim, shape_cls, [wall])
-    sim.run(0)
     sim.operations.remove(mc)
     assert not mc._attached
     assert not walls._attached
@@ -154,100 +227,103 @@ for shape in _integrator_classes:
 
 
 @pytest.mark.cpu
-@pytest.mark.parametrize("shape_cls, wall_validity", shape_multiwall_combos)
-def test_multiple_wall_geometries(simulation_factory, shape_cls, wall_validity,
-                                  two_particle_snapshot_factory,
-                                  add_default_integrator):
-    sim = simulation_factory(two_particle_snapshot_factory())
+@pytest.mark.parametrize(
+    "shape_cls, wall_validity",
+    shape_multiwall_combos,
+    ids=[
+        f"{shape.__name__}-{_wall_ids(w for w, _ in wall_validity)}"
+        for shape, wall_validity in shape_multiwall_combos
+    ])
+def test_multiple_wall_geometries(two_particle_simulation, shape_cls,
+                                  wall_validity, add_default_integrator):
+    sim = two_particle_simulation
     walls = [x[0] for x in wall_validity]
     is_valids = [x[1] for x in wall_validity]
     mc, walls = add_default_integrator(sim, shape_cls, walls)
     if all(is_valids):
-        sim.run(0)
+        sim.operations._schedule()
     else:
         with pytest.raises(NotImplementedError):
-            sim.run(0)
+            sim.operations._schedule()
 
 
 @pytest.mark.cpu
-def test_replace_with_invalid(simulation_factory, two_particle_snapshot_factory,
-                              add_default_integrator):
-    sim = simulation_factory(two_particle_snapshot_factory())
+def test_replace_with_invalid(two_particle_simulation, add_default_integrator):
+    sim = two_particle_simulation
     integrator_class = hoomd.hpmc.integrate.ConvexSpheropolyhedron
     wall_types = [hoomd.wall.Sphere, hoomd.wall.Plane]
     mc, walls = add_default_integrator(sim, integrator_class, wall_types)
-    sim.run(0)
+    sim.operations._schedule()
     with pytest.raises(NotImplementedError):
         mc.external_potential.walls = [hoomd.wall.Cylinder(1.2345, (0, 0, 0))]
 
 
 @pytest.mark.cpu
-def test_replace_with_invalid_by_append(simulation_factory,
-                                        two_particle_snapshot_factory,
+def test_replace_with_invalid_by_append(two_particle_simulation,
                                         add_default_integrator):
-    sim = simulation_factory(two_particle_snapshot_factory())
+    sim = two_particle_simulation
     integrator_class = hoomd.hpmc.integrate.ConvexSpheropolyhedron
     wall_types = [hoomd.wall.Sphere, hoomd.wall.Plane]
     mc, walls = add_default_integrator(sim, integrator_class, wall_types)
-    sim.run(0)
+    sim.operations._schedule()
     with pytest.raises(NotImplementedError):
         new_wall = hoomd.wall.Cylinder(1.2345, (0, 0, 0))
         mc.external_potential.walls.append(new_wall)
 
 
 @pytest.mark.cpu
-def test_replace_with_invalid_by_extend(simulation_factory,
-                                        two_particle_snapshot_factory,
+def test_replace_with_invalid_by_extend(two_particle_simulation,
                                         add_default_integrator):
-    sim = simulation_factory(two_particle_snapshot_factory())
+    sim = two_particle_simulation
     integrator_class = hoomd.hpmc.integrate.ConvexSpheropolyhedron
     wall_types = [hoomd.wall.Sphere, hoomd.wall.Plane]
     mc, walls = add_default_integrator(sim, integrator_class, wall_types)
-    sim.run(0)
+    sim.operations._schedule()
     with pytest.raises(NotImplementedError):
         new_walls = [hoomd.wall.Cylinder(1.2345, (0, 0, 0))]
         mc.external_potential.walls.extend(new_walls)
 
 
 @pytest.mark.cpu
-def test_replace_with_valid(simulation_factory, two_particle_snapshot_factory,
-                            add_default_integrator):
-    sim = simulation_factory(two_particle_snapshot_factory())
+def test_replace_with_valid(two_particle_simulation, add_default_integrator):
+    sim = two_particle_simulation
     integrator_class = hoomd.hpmc.integrate.ConvexSpheropolyhedron
     wall_types = [hoomd.wall.Plane]
     mc, walls = add_default_integrator(sim, integrator_class, wall_types)
-    sim.run(0)
+    sim.operations._schedule()
     mc.external_potential.walls = [hoomd.wall.Sphere(1.0)]
 
 
 @pytest.mark.cpu
-def test_replace_with_valid_by_append(simulation_factory,
-                                      two_particle_snapshot_factory,
+def test_replace_with_valid_by_append(two_particle_simulation,
                                       add_default_integrator):
-    sim = simulation_factory(two_particle_snapshot_factory())
+    sim = two_particle_simulation
     integrator_class = hoomd.hpmc.integrate.ConvexSpheropolyhedron
     wall_types = [hoomd.wall.Plane]
     mc, walls = add_default_integrator(sim, integrator_class, wall_types)
-    sim.run(0)
+    sim.operations._schedule()
     mc.external_potential.walls.append(hoomd.wall.Sphere(1.0))
 
 
 @pytest.mark.cpu
-def test_replace_with_valid_by_extend(simulation_factory,
-                                      two_particle_snapshot_factory,
+def test_replace_with_valid_by_extend(two_particle_simulation,
                                       add_default_integrator):
-    sim = simulation_factory(two_particle_snapshot_factory())
+    sim = two_particle_simulation
     integrator_class = hoomd.hpmc.integrate.ConvexSpheropolyhedron
     wall_types = [hoomd.wall.Plane]
     mc, walls = add_default_integrator(sim, integrator_class, wall_types)
-    sim.run(0)
+    sim.operations._schedule()
     mc.external_potential.walls.extend([hoomd.wall.Sphere(1.0)])
 
 
 L_cube = 1.0
-cube_vertices = np.array(
-    list(itertools.product((-L_cube / 2, L_cube / 2), repeat=3)))
-cube_rc = max(np.linalg.norm(cube_vertices, axis=1))  # circumsphere radius
+_cube_coords = np.array([-L_cube / 2, L_cube / 2])
+cube_vertices = np.stack(np.meshgrid(_cube_coords,
+                                     _cube_coords,
+                                     _cube_coords,
+                                     indexing='ij'),
+                         axis=-1).reshape(-1, 3)
+cube_rc = np.linalg.norm(cube_vertices, axis=1).max()  # circumsphere radius
 cube_face_rc = np.sqrt(2) / 2
 cube_r_s = 0.1  # sweep radius for spherocube
 rot_x_45deg = [0.92387953, 0.38268343, 0, 0]
@@ -560,21 +636,47 @@ overlap_test_info = [
 ]
 
 
+_overlap_shapes = (hoomd.hpmc.integrate.Sphere,
+                   hoomd.hpmc.integrate.ConvexPolyhedron,
+                   hoomd.hpmc.integrate.ConvexSpheropolyhedron)
+# Group the cases by shape so consecutive tests reuse the same integrator.
+overlap_test_info.sort(key=lambda case: _overlap_shapes.index(case[2]))
+
+
+@pytest.fixture(scope="module")
+def overlap_simulation(module_one_particle_simulation):
+    """Return a function that readies the one particle simulation for a shape.
+
+    The integrator is only replaced when the integrator class changes. Tests
+    set the shape, walls, and particle configuration they need.
+    """
+    sim = module_one_particle_simulation
+
+    def prepare(integrator_class):
+        mc = sim.operations.integrator
+        if type(mc) is not integrator_class:
+            mc = _make_integrator(integrator_class, [])
+            sim.operations.integrator = mc
+        return sim, mc
+
+    yield prepare
+    _reset_simulation(sim)
+
+
 @pytest.mark.cpu
 @pytest.mark.parametrize(
     "pos, orientation, shape, wall_list, shapedef, expecting_overlap",
-    overlap_test_info)
-def test_overlaps(simulation_factory, one_particle_snapshot_factory,
-                  add_default_integrator, pos, orientation, shape, wall_list,
+    overlap_test_info,
+    ids=[f"{case[2].__name__}-{i}" for i, case in enumerate(overlap_test_info)])
+def test_overlaps(overlap_simulation, pos, orientation, shape, wall_list,
                   shapedef, expecting_overlap):
-    sim = simulation_factory(
-        one_particle_snapshot_factory(position=pos,
-                                      orientation=orientation,
-                                      L=100))
-    mc, walls = add_default_integrator(sim,
-                                       shape,
-                                       wall_list,
-                                       use_default_wall_args=False)
+    sim, mc = overlap_simulation(shape)
     mc.shape['A'] = shapedef
-    sim.run(0)
+    mc.external_potential.walls = wall_list
+    snapshot = sim.state.get_snapshot()
+    if snapshot.communicator.rank == 0:
+        snapshot.particles.position[0] = pos
+        snapshot.particles.orientation[0] = orientation
+    sim.state.set_snapshot(snapshot)
+    sim.operations._schedule()
     assert (mc.external_potential.overlaps > 0) == expecting_overlap
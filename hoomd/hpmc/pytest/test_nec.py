@@ -0,0 +1,24 @@
+# Copyright (c) 2009-2023 The Regents of the University of Michigan.
+# Part of HOOMD-blue, released under the BSD 3-Clause License.
+
+"""Test hoomd.hpmc.nec.integrate."""
+
+import hoomd
+import hoomd.hpmc.nec
+import pytest
+
+
+@pytest.mark.serial
+@pytest.mark.cpu
+def test_chain_statistics_before_run(device, simulation_factory,
+                                     lattice_snapshot_factory):
+    """Chain statistics are 0 before any chain events."""
+    mc = hoomd.hpmc.nec.integrate.Sphere()
+    mc.shape['A'] = dict(diameter=1)
+
+    sim = simulation_factory(lattice_snapshot_factory(a=1.5, n=4))
+    sim.operations.integrator = mc
+    sim.operations._schedule()
+
+    assert mc.particles_per_chain == 0.0
+    assert mc.chains_in_space == 0.0
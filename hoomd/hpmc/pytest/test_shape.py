@@ -2,6 +2,7 @@
 # Part of HOOMD-blue, released under the BSD 3-Clause License.
 
 from collections.abc import Sequence
+import numbers
 
 import hoomd
 from hoomd.conftest import (operation_pickling_check, logging_check,
@@ -27,6 +28,7 @@ def check_dict(shape_dict, args):
     Useful for more complex nested dictionaries (like the shape key in unions)
     Used to test that the dictionary passed in is what gets passed out
     """
+    scalar_keys = []
     for key, val in args.items():
         if isinstance(shape_dict[key], list) and len(shape_dict[key]) > 0 \
            and key != 'shapes':
@@ -41,8 +43,14 @@ def check_dict(shape_dict, args):
                                                    shape_args[shape_key])
                     else:
                         assert shape_args[shape_key] == val_args[shape_key]
+        elif isinstance(val, numbers.Number):
+            scalar_keys.append(key)
         else:
             np.testing.assert_almost_equal(shape_dict[key], val)
+    # Compare all numeric scalar parameters at once.
+    np.testing.assert_almost_equal([shape_dict[key] for key in scalar_keys],
+                                   [args[key] for key in scalar_keys],
+                                   err_msg=f"keys: {scalar_keys}")
 
 
 def test_dict_conversion(cpp_args):
@@ -189,10 +197,10 @@ def test_overlaps_sphere(device, sphere_overlap_args, simulation_factory,
         two_particle_snapshot_factory(dimensions=3, d=diameter * 0.9))
     sim.operations.add(mc)
     sim.operations._schedule()
+    s = sim.state.get_snapshot()
     assert mc.overlaps > 0
 
     # Should not overlap when spheres are larger than one diameter apart
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (0, diameter * 1.1, 0)
@@ -200,7 +208,6 @@ def test_overlaps_sphere(device, sphere_overlap_args, simulation_factory,
     assert mc.overlaps == 0
 
     # Should barely overlap when spheres are exactly than one diameter apart
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (0, diameter * 0.9999, 0)
@@ -219,13 +226,13 @@ def test_overlaps_ellipsoid(device, simulation_factory,
     sim = simulation_factory(two_particle_snapshot_factory(dimensions=3, d=2))
     sim.operations.add(mc)
     sim.operations._schedule()
+    s = sim.state.get_snapshot()
     assert mc.overlaps == 0
 
     abc_list = [(0, 0, c), (0, b, 0), (a, 0, 0)]
     for abc in abc_list:
         # Should barely overlap when ellipsoids are exactly than one diameter
         # apart
-        s = sim.state.get_snapshot()
         if s.communicator.rank == 0:
             s.particles.position[0] = (0, 0, 0)
             s.particles.position[1] = (abc[0] * 0.9 * 2, abc[1] * 0.9 * 2,
@@ -234,7 +241,6 @@ def test_overlaps_ellipsoid(device, simulation_factory,
         assert mc.overlaps == 1
 
         # Should not overlap when ellipsoids are larger than one diameter apart
-        s = sim.state.get_snapshot()
         if s.communicator.rank == 0:
             s.particles.position[0] = (0, 0, 0)
             s.particles.position[1] = (abc[0] * 1.15 * 2, abc[1] * 1.15 * 2,
@@ -244,7 +250,6 @@ def test_overlaps_ellipsoid(device, simulation_factory,
 
     # Line up ellipsoids where they aren't overlapped, and then rotate one so
     # they overlap
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (a * 1.1 * 2, 0, 0)
@@ -255,8 +260,8 @@ def test_overlaps_ellipsoid(device, simulation_factory,
 
 
 _triangle = {
-    'vertices': [(0, (0.75**0.5) / 2), (-0.5, -(0.75**0.5) / 2),
-                 (0.5, -(0.75**0.5) / 2)]
+    'vertices': ((0, (0.75**0.5) / 2), (-0.5, -(0.75**0.5) / 2),
+                 (0.5, -(0.75**0.5) / 2))
 }
 _square = {"vertices": np.array([(-1, -1), (1, -1), (1, 1), (-1, 1)]) / 2}
 # Args should work for ConvexPolygon, SimplePolygon, and ConvexSpheropolygon
@@ -283,18 +288,17 @@ def test_overlaps_polygons(device, polygon_overlap_args, simulation_factory,
     sim = simulation_factory(two_particle_snapshot_factory(dimensions=3, d=2))
     sim.operations.add(mc)
     sim.operations._schedule()
+    s = sim.state.get_snapshot()
     assert mc.overlaps == 0
 
     # Place center of shape 2 on each of shape 1's vertices
     for vert in mc.shape["A"]["vertices"]:
-        s = sim.state.get_snapshot()
         if s.communicator.rank == 0:
             s.particles.position[0] = (0, 0, 0)
             s.particles.position[1] = (vert[0], vert[1], 0)
         sim.state.set_snapshot(s)
         assert mc.overlaps > 0
 
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (0, 1.05, 0)
@@ -302,7 +306,6 @@ def test_overlaps_polygons(device, polygon_overlap_args, simulation_factory,
     assert mc.overlaps == 0
 
     # Rotate one of the shapes so they will overlap
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.orientation[1] = tuple(
             np.array([1, 0, 0, 0.45]) / (1.2025**0.5))
@@ -313,14 +316,14 @@ def test_overlaps_polygons(device, polygon_overlap_args, simulation_factory,
 _tetrahedron_verts = np.array([(1, 1, 1), (-1, -1, 1), (1, -1, -1),
                                (-1, 1, -1)]) / 2
 
-_tetrahedron_faces = [[1, 3, 2], [3, 0, 2], [1, 0, 3], [1, 2, 0]]
+_tetrahedron_faces = ((1, 3, 2), (3, 0, 2), (1, 0, 3), (1, 2, 0))
 
-_cube_verts = [(-0.5, -0.5, -0.5), (-0.5, -0.5, 0.5), (-0.5, 0.5, -0.5),
+_cube_verts = ((-0.5, -0.5, -0.5), (-0.5, -0.5, 0.5), (-0.5, 0.5, -0.5),
                (-0.5, 0.5, 0.5), (0.5, -0.5, -0.5), (0.5, -0.5, 0.5),
-               (0.5, 0.5, -0.5), (0.5, 0.5, 0.5)]
+               (0.5, 0.5, -0.5), (0.5, 0.5, 0.5))
 
-_cube_faces = [[0, 2, 6], [6, 4, 0], [5, 0, 4], [5, 1, 0], [5, 4, 6], [5, 6, 7],
-               [3, 2, 0], [3, 0, 1], [3, 6, 2], [3, 7, 6], [3, 1, 5], [3, 5, 7]]
+_cube_faces = ((0, 2, 6), (6, 4, 0), (5, 0, 4), (5, 1, 0), (5, 4, 6), (5, 6, 7),
+               (3, 2, 0), (3, 0, 1), (3, 6, 2), (3, 7, 6), (3, 1, 5), (3, 5, 7))
 
 # Test args with ConvexPolyhedron, ConvexSpheropolyhedron, and Polyhedron
 _polyhedron_shapes = [({
@@ -360,25 +363,23 @@ def test_overlaps_polyhedra(device, polyhedron_overlap_args, simulation_factory,
     sim = simulation_factory(two_particle_snapshot_factory(dimensions=3, d=2))
     sim.operations.add(mc)
     sim.operations._schedule()
+    s = sim.state.get_snapshot()
     assert mc.overlaps == 0
 
     # Place center of shape 2 on each of shape 1's vertices
     for vert in mc.shape["A"]["vertices"]:
-        s = sim.state.get_snapshot()
         if s.communicator.rank == 0:
             s.particles.position[0] = (0, 0, 0)
             s.particles.position[1] = vert
         sim.state.set_snapshot(s)
         assert mc.overlaps > 0
 
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (0, 0.9, 0)
     sim.state.set_snapshot(s)
     assert mc.overlaps > 0
 
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (0, 1.1, 0)
@@ -386,7 +387,6 @@ def test_overlaps_polyhedra(device, polyhedron_overlap_args, simulation_factory,
     assert mc.overlaps == 0
 
     # Rotate one of the polyhedra so they will overlap
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.orientation[1] = tuple(np.array([1, 1, 1, 0]) / (3**0.5))
     sim.state.set_snapshot(s)
@@ -416,11 +416,11 @@ def test_overlaps_spheropolygon(device, spheropolygon_overlap_args,
     sim = simulation_factory(two_particle_snapshot_factory(dimensions=2, d=2))
     sim.operations.add(mc)
     sim.operations._schedule()
+    s = sim.state.get_snapshot()
     assert mc.overlaps == 0
 
     # Place center of shape 2 on each of shape 1's vertices
     for vert in mc.shape["A"]["vertices"]:
-        s = sim.state.get_snapshot()
         if s.communicator.rank == 0:
             s.particles.position[0] = (0, 0, 0)
             s.particles.position[1] = (vert[0], vert[1], 0)
@@ -428,14 +428,12 @@ def test_overlaps_spheropolygon(device, spheropolygon_overlap_args,
         assert mc.overlaps > 0
 
     # Place shapes where they wouldn't overlap w/o sweep radius
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (0, 1.2, 0)
     sim.state.set_snapshot(s)
     assert mc.overlaps > 0
 
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (0, 1.3, 0)
@@ -443,7 +441,6 @@ def test_overlaps_spheropolygon(device, spheropolygon_overlap_args,
     assert mc.overlaps == 0
 
     # Rotate one of the shapes so they will overlap
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.orientation[1] = tuple(
             np.array([1, 0, 0, 0.45]) / (1.2025**0.5))
@@ -474,25 +471,23 @@ def test_overlaps_spheropolyhedron(device, spheropolyhedron_overlap_args,
     sim = simulation_factory(two_particle_snapshot_factory(dimensions=3, d=2))
     sim.operations.add(mc)
     sim.operations._schedule()
+    s = sim.state.get_snapshot()
     assert mc.overlaps == 0
 
     # Place center of shape 2 on each of shape 1's vertices
     for vert in mc.shape["A"]["vertices"]:
-        s = sim.state.get_snapshot()
         if s.communicator.rank == 0:
             s.particles.position[0] = (0, 0, 0)
             s.particles.position[1] = vert
         sim.state.set_snapshot(s)
         assert mc.overlaps > 0
 
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (0, 1.2, 0)
     sim.state.set_snapshot(s)
     assert mc.overlaps > 0
 
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (0, 1.5, 0)
@@ -500,7 +495,6 @@ def test_overlaps_spheropolyhedron(device, spheropolyhedron_overlap_args,
     assert mc.overlaps == 0
 
     # Rotate one of the polyhedra so they will overlap
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.orientation[1] = tuple(np.array([1, 1, 1, 0]) / (3**0.5))
     sim.state.set_snapshot(s)
@@ -546,6 +540,7 @@ def test_overlaps_union(device, union_overlap_args, simulation_factory,
     sim = simulation_factory(two_particle_snapshot_factory(dimensions=3, d=2))
     sim.operations.add(mc)
     sim.operations._schedule()
+    s = sim.state.get_snapshot()
 
     assert mc.overlaps == 0
     test_positions = [(1.1, 0, 0), (0, 1.1, 0)]
@@ -555,7 +550,6 @@ def test_overlaps_union(device, union_overlap_args, simulation_factory,
     test_orientations = test_orientations.T
     # Shapes are stacked in z direction
     for i in range(len(test_positions)):
-        s = sim.state.get_snapshot()
         if s.communicator.rank == 0:
             s.particles.position[0] = (0, 0, 0)
             s.particles.position[1] = test_positions[i]
@@ -571,7 +565,6 @@ def test_overlaps_union(device, union_overlap_args, simulation_factory,
         assert mc.overlaps > 0
 
     for pos in [(0.9, 0, 0), (0, 0.9, 0), (0, 0, 1.1)]:
-        s = sim.state.get_snapshot()
         if s.communicator.rank == 0:
             s.particles.position[0] = (0, 0, 0)
             s.particles.position[1] = pos
@@ -598,13 +591,13 @@ def test_overlaps_faceted_ellipsoid(device, simulation_factory,
     sim = simulation_factory(two_particle_snapshot_factory(dimensions=3, d=2))
     sim.operations.add(mc)
     sim.operations._schedule()
+    s = sim.state.get_snapshot()
     assert mc.overlaps == 0
 
     abc_list = [(0, 0, c / 2), (0, b, 0), (a, 0, 0)]
     for abc in abc_list:
         # Should barely overlap when ellipsoids are exactly than one diameter
         # apart
-        s = sim.state.get_snapshot()
         if s.communicator.rank == 0:
             s.particles.position[0] = (0, 0, 0)
             s.particles.position[1] = (abc[0] * 0.9 * 2, abc[1] * 0.9 * 2,
@@ -613,7 +606,6 @@ def test_overlaps_faceted_ellipsoid(device, simulation_factory,
         assert mc.overlaps == 1
 
         # Should not overlap when ellipsoids are larger than one diameter apart
-        s = sim.state.get_snapshot()
         if s.communicator.rank == 0:
             s.particles.position[0] = (0, 0, 0)
             s.particles.position[1] = (abc[0] * 1.15 * 2, abc[1] * 1.15 * 2,
@@ -623,7 +615,6 @@ def test_overlaps_faceted_ellipsoid(device, simulation_factory,
 
     # Line up ellipsoids where they aren't overlapped, and then rotate one so
     # they overlap
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (a * 1.1 * 2, 0, 0)
@@ -642,16 +633,15 @@ def test_overlaps_sphinx(device, simulation_factory,
     sim = simulation_factory(two_particle_snapshot_factory(dimensions=3, d=2))
     sim.operations.add(mc)
     sim.operations._schedule()
+    s = sim.state.get_snapshot()
     assert mc.overlaps == 0
 
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (0.74, 0, 0)
     sim.state.set_snapshot(s)
     assert mc.overlaps > 0
 
-    s = sim.state.get_snapshot()
     if s.communicator.rank == 0:
         s.particles.position[0] = (0, 0, 0)
         s.particles.position[1] = (0.76, 0, 0)
@@ -67,9 +67,8 @@ class ShapeMove(_HOOMDBaseObject):
                                      self.__class__.__name__ + integrator_name)
         else:
             raise RuntimeError("Integrator not supported")
-        self._cpp_obj = self._move_cls(
-            self._simulation.state._cpp_sys_def,
-            self._simulation.operations.integrator._cpp_obj)
+        self._cpp_obj = self._move_cls(self._simulation.state._cpp_sys_def,
+                                       integrator._cpp_obj)
 
 
 class Elastic(ShapeMove):
@@ -167,11 +166,11 @@ class Elastic(ShapeMove):
     def _attach_hook(self):
         integrator = self._simulation.operations.integrator
         if isinstance(integrator, integrate.Ellipsoid):
-            for shape in integrator.shape.values():
-                is_sphere = numpy.allclose((shape["a"], shape["b"], shape["c"]),
-                                           shape["a"])
-                if not is_sphere:
-                    raise ValueError("This updater only works when a=b=c.")
+            abc = numpy.array([(shape["a"], shape["b"], shape["c"])
+                               for shape in integrator.shape.values()
+                              ]).reshape(-1, 3)
+            if not numpy.allclose(abc, abc[:, :1]):
+                raise ValueError("This updater only works when a=b=c.")
         super()._attach_hook()
 
 
@@ -5,14 +5,16 @@ import hoomd
 import numpy
 
 
-def test_per_particle_virial(simulation_factory, lattice_snapshot_factory):
+def test_per_particle_virial(simulation_factory, lattice_snapshot_factory,
+                             rng):
     cell = hoomd.md.nlist.Cell(buffer=0.4)
     lj = hoomd.md.pair.LJ(nlist=cell)
     lj.params[('A', 'A')] = dict(sigma=1.0, epsilon=1.0)
     lj.r_cut[('A', 'A')] = 2.5
 
     a = 2**(1.0 / 6.0)
-    sim = simulation_factory(lattice_snapshot_factory(n=20, a=a, r=a * 0.01))
+    sim = simulation_factory(
+        lattice_snapshot_factory(n=20, a=a, r=a * 0.01, rng=rng))
 
     assert not sim.always_compute_pressure
 
@@ -156,6 +156,7 @@ class TestHoomdTuple(BaseSequenceTest):
 
 class TestHoomdDict(BaseMappingTest):
     _allow_new_keys = False
+    _fast_eq = True
 
     @pytest.fixture
     def generate_plain_collection(self):
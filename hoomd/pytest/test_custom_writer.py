@@ -2,6 +2,7 @@
 # Part of HOOMD-blue, released under the BSD 3-Clause License.
 
 import hoomd
+import numpy
 import pytest
 from hoomd import conftest
 
@@ -95,3 +96,46 @@ class TestCustomWriter:
         sim.operations += writer
         sim.run(10)
         assert writer.timesteps_run == [2, 4, 6, 8, 10]
+
+
+class _Value:
+    value = 0
+
+
+def _log_values(values):
+    obj = _Value()
+    writer = conftest.ListWriter(obj, "value")
+    for value in values:
+        obj.value = value
+        writer.act(0)
+    return writer.data
+
+
+def test_list_writer_empty():
+    assert len(conftest.ListWriter(_Value(), "value").data) == 0
+
+
+def test_list_writer_grows():
+    data = _log_values(range(200))
+    assert data.dtype == numpy.int_
+    numpy.testing.assert_array_equal(data, numpy.arange(200))
+
+
+def test_list_writer_upcasts():
+    data = _log_values([1, 2, 2.5])
+    assert data.dtype == numpy.float64
+    numpy.testing.assert_array_equal(data, [1, 2, 2.5])
+
+
+def test_list_writer_rows():
+    data = _log_values([(1, 2), (3, 4)])
+    numpy.testing.assert_array_equal(data, [[1, 2], [3, 4]])
+
+
+def test_list_writer_shape_change():
+    data = _log_values([(1, 2), (3, 4), (5,), None])
+    assert data.dtype == object
+    assert len(data) == 4
+    numpy.testing.assert_array_equal(data[1], (3, 4))
+    assert data[2] == (5,)
+    assert data[3] is None
@@ -37,6 +37,7 @@ class DummyCppObj:
 
 class TestParameterDict(BaseMappingTest):
     _has_default = False
+    _fast_eq = True
 
     @pytest.fixture(params=(1, 2, 3), ids=lambda x: f"n={x}")
     def n(self, request):
@@ -10,6 +10,7 @@ def pytest_addoption(parser):
     """Add HOOMD specific options to the pytest command line.
 
     * validate - run validation tests
+    * all-combinations - run every case of combinatorially parametrized tests
     """
     parser.addoption(
         "--validate",
@@ -17,6 +18,12 @@ def pytest_addoption(parser):
         default=False,
         help="Enable long running validation tests.",
     )
+    parser.addoption(
+        "--all-combinations",
+        action="store_true",
+        default=False,
+        help="Enable redundant cases of combinatorially parametrized tests.",
+    )
 
 
 @pytest.fixture(autouse=True)
@@ -31,6 +38,9 @@ def skip_validate(request):
 
 
 def pytest_configure(config):
-    """Define the ``validate`` marker."""
+    """Define the ``validate`` and ``all_combinations`` markers."""
     config.addinivalue_line(
         "markers", "validate: Tests that perform long-running validations.")
+    config.addinivalue_line(
+        "markers", "all_combinations: Parameter combinations that are "
+        "redundant with other cases of the same test.")